@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+OGG音频转换核心
+不依赖图形界面，支持文件路径、字节数据和二进制流的转换
+"""
+
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# 延迟导入音频处理库以便给出更好的错误提示
+try:
+    from pydub import AudioSegment
+    PYDUB_AVAILABLE = True
+except ImportError:
+    PYDUB_AVAILABLE = False
+    AudioSegment = None
+
+# 尝试导入其他音频处理库作为备选
+try:
+    import librosa
+    import soundfile as sf
+    import numpy as np
+    LIBROSA_AVAILABLE = True
+except ImportError:
+    LIBROSA_AVAILABLE = False
+    sf = None
+    np = None
+
+try:
+    import mutagen
+    from mutagen.oggvorbis import OggVorbis
+    MUTAGEN_AVAILABLE = True
+except ImportError:
+    MUTAGEN_AVAILABLE = False
+
+# 输出目标配置，格式: 格式[:码率[:采样格式]]，多个目标以逗号分隔
+# 码率仅适用于mp3，采样格式仅适用于wav/flac
+# 不指定码率的mp3使用默认的高质量VBR设置，指定码率时使用固定码率
+DEFAULT_OUTPUT_TARGETS = "mp3"
+DEFAULT_MP3_BITRATE = "192k"
+# DEFAULT_OUTPUT_TARGETS解析后的单一目标
+DEFAULT_OUTPUT_TARGET = {"format": "mp3", "bitrate": None, "sample_format": None}
+SUPPORTED_OUTPUT_FORMATS = ("mp3", "wav", "flac")
+
+# 采样格式对应的pydub样本宽度（字节）与soundfile子类型
+SAMPLE_FORMAT_WIDTHS = {"s16": 2, "s24": 3, "s32": 4}
+SAMPLE_FORMAT_SUBTYPES = {"s16": "PCM_16", "s24": "PCM_24", "s32": "PCM_32", "f32": "FLOAT"}
+
+# 各格式支持的采样格式（soundfile写FLAC仅支持16/24位整数）
+PCM_SAMPLE_FORMATS = {"wav": ("s16", "s24", "s32", "f32"), "flac": ("s16", "s24")}
+
+def get_available_converters():
+    """获取可用的音频处理库列表（按优先级排序）"""
+    available_libs = []
+    if PYDUB_AVAILABLE:
+        available_libs.append("pydub")
+    if LIBROSA_AVAILABLE:
+        available_libs.append("librosa")
+    if MUTAGEN_AVAILABLE:
+        available_libs.append("mutagen")
+    return available_libs
+
+class OGGAudioConverter:
+    """不依赖界面的转换核心，支持文件路径、字节数据和二进制流"""
+    
+    def __init__(self, converter_priority=None):
+        if converter_priority is None:
+            converter_priority = get_available_converters()
+        self.converter_priority = converter_priority
+    
+    def parse_output_targets(self, spec):
+        """解析输出目标配置，例如 "mp3:192k, mp3:96k, wav::s16" """
+        targets = []
+        
+        for item in spec.split(","):
+            item = item.strip()
+            if not item:
+                continue
+            
+            parts = [part.strip().lower() for part in item.split(":")]
+            if len(parts) > 3:
+                raise ValueError(f"输出目标格式错误: {item}")
+            parts += [""] * (3 - len(parts))
+            output_format, bitrate, sample_format = parts
+            
+            if output_format not in SUPPORTED_OUTPUT_FORMATS:
+                raise ValueError(f"不支持的输出格式: {output_format}")
+            if bitrate and output_format != "mp3":
+                raise ValueError(f"码率仅适用于mp3格式: {item}")
+            if bitrate and not (bitrate[:-1].isdigit() and bitrate.endswith("k")):
+                raise ValueError(f"码率格式错误（例如192k）: {item}")
+            if sample_format and sample_format not in SAMPLE_FORMAT_SUBTYPES:
+                raise ValueError(f"不支持的采样格式: {sample_format}")
+            if sample_format and sample_format not in PCM_SAMPLE_FORMATS.get(output_format, ()):
+                raise ValueError(f"{output_format}格式不支持采样格式{sample_format}: {item}")
+            
+            target = {
+                "format": output_format,
+                "bitrate": bitrate or None,
+                "sample_format": sample_format or None
+            }
+            # 忽略重复的输出目标
+            if target not in targets:
+                targets.append(target)
+        
+        if not targets:
+            raise ValueError("请至少设置一个输出目标")
+        
+        return targets
+    
+    def get_target_file_name(self, base_name, target):
+        """根据目标自身的设置生成文件名，不同设置的目标文件名必然不同"""
+        tag = "_".join(v for v in (target["bitrate"], target["sample_format"]) if v)
+        if tag:
+            return f"{base_name}_{tag}.{target['format']}"
+        return f"{base_name}.{target['format']}"
+    
+    def format_target(self, target):
+        """将目标还原为配置写法，例如 "wav::s24" """
+        parts = [target["format"], target["bitrate"] or "", target["sample_format"] or ""]
+        return ":".join(parts).rstrip(":")
+    
+    def open_input_stream(self, source):
+        """将字节数据或二进制流包装为可回退读取的输入流"""
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            # 仅bytes会与BytesIO共享缓冲区，bytearray/memoryview会被拷贝一次
+            return io.BytesIO(source)
+        
+        seekable = getattr(source, "seekable", None)
+        if seekable is not None and seekable():
+            return source
+        
+        # 不可回退的流（如网络流）读取一次，供多个解码方案重复使用
+        return io.BytesIO(source.read())
+    
+    def decode_with(self, converter, source):
+        """使用指定方案解码OGG数据（文件路径或二进制流），成功返回(方案, 音频数据)"""
+        if converter == "librosa" and LIBROSA_AVAILABLE and sf is not None:
+            audio_data, sample_rate = librosa.load(source, sr=None)
+            if audio_data.size == 0:
+                raise RuntimeError("音频文件为空")
+            return converter, (audio_data, sample_rate)
+            
+        elif converter == "pydub" and PYDUB_AVAILABLE:
+            audio = AudioSegment.from_ogg(source)
+            if len(audio) == 0:
+                raise RuntimeError("音频文件为空")
+            return converter, audio
+            
+        elif converter == "mutagen" and MUTAGEN_AVAILABLE:
+            # mutagen只能读取元数据，无法解码音频
+            raise RuntimeError("mutagen方法需要额外的编码器支持")
+        
+        raise RuntimeError("不可用")
+    
+    def resolve_target(self, converter, target):
+        """确定方案实际能输出的目标（librosa方案无FFmpeg，MP3目标改为默认设置的WAV）"""
+        if converter == "librosa" and target["format"] == "mp3":
+            return {"format": "wav", "bitrate": None, "sample_format": None}
+        return target
+    
+    def encode_target(self, converter, audio, output, target):
+        """将已解码的音频编码为单个输出目标，output为文件路径或新建的空二进制流
+        
+        pydub导出时会先回到流的开头，因此不能直接写入已有数据的流。
+        """
+        if isinstance(output, str):
+            try:
+                with open(output, "wb") as output_file:
+                    self.encode_target(converter, audio, output_file, target)
+            except Exception:
+                # 删除编码失败留下的不完整文件
+                if os.path.exists(output):
+                    os.remove(output)
+                raise
+            return
+        
+        output_format = target["format"]
+        sample_format = target["sample_format"]
+        
+        try:
+            if converter == "librosa":
+                # 解码得到的PCM数组直接交给编码器，不经过中间缓冲
+                audio_data, sample_rate = audio
+                sf.write(
+                    output,
+                    audio_data,
+                    sample_rate,
+                    format=output_format.upper(),
+                    subtype=SAMPLE_FORMAT_SUBTYPES.get(sample_format)
+                )
+            else:
+                export_options = {"format": output_format}
+                if output_format == "mp3" and target["bitrate"]:
+                    # 指定码率时使用固定码率，-q:a会覆盖码率设置
+                    export_options["bitrate"] = target["bitrate"]
+                elif output_format == "mp3":
+                    export_options["bitrate"] = DEFAULT_MP3_BITRATE
+                    export_options["parameters"] = ["-q:a", "2"]  # 高质量设置
+                
+                if sample_format in SAMPLE_FORMAT_WIDTHS:
+                    audio = audio.set_sample_width(SAMPLE_FORMAT_WIDTHS[sample_format])
+                elif sample_format == "f32":
+                    export_options["codec"] = "pcm_f32le"
+                
+                audio.export(output, **export_options)
+            
+            # 根据写入的字节数验证输出，无需重新读取文件状态
+            output.seek(0, io.SEEK_END)
+            if output.tell() == 0:
+                raise RuntimeError("输出文件创建失败")
+        except Exception:
+            # 丢弃写入一半的数据，以便下一方案重新写入
+            output.seek(0)
+            output.truncate()
+            raise
+    
+    def describe_error(self, error):
+        """将异常转换为用户可读的错误信息"""
+        error_msg = str(error)
+        if isinstance(error, FileNotFoundError):
+            if "ffmpeg" in error_msg.lower():
+                return "FFmpeg未安装。建议安装轻量级音频库: pip install librosa soundfile"
+            return f"文件操作错误: {error_msg}"
+        if "ffmpeg" in error_msg.lower():
+            return "FFmpeg相关错误。建议使用无FFmpeg依赖的方案"
+        elif "permission" in error_msg.lower():
+            return "文件权限错误，请检查文件是否被占用"
+        elif "memory" in error_msg.lower():
+            return "内存不足，请关闭其他程序后重试"
+        else:
+            return f"转换错误: {error_msg}"
+    
+    def convert_targets(self, source, targets, get_output):
+        """解码并编码到所有目标，某方案编码失败的目标由下一方案重新解码后重试
+        
+        get_output(实际目标)返回(文件路径或二进制流, 名称)。
+        成功返回各目标对应的实际目标列表，失败返回错误信息。
+        """
+        results = [None] * len(targets)
+        errors = []
+        produced = []
+        start_position = None if isinstance(source, str) else source.tell()
+        
+        for converter in self.converter_priority:
+            pending = [i for i, result in enumerate(results) if result is None]
+            if not pending:
+                break
+            
+            try:
+                if start_position is not None:
+                    source.seek(start_position)
+                decoded = self.decode_with(converter, source)
+            except Exception as e:
+                errors.append(f"{converter}: {str(e)}")
+                continue
+            
+            # 与已输出目标设置相同的目标无需重复编码，设置相同的待输出目标只编码一次
+            written = [result for result in results if result is not None]
+            jobs = []
+            for i in pending:
+                effective = self.resolve_target(converter, targets[i])
+                if effective in written:
+                    results[i] = effective
+                elif effective not in jobs:
+                    jobs.append(effective)
+            
+            # 解码后的音频数据同时分发给所有编码器
+            succeeded = []
+            with ThreadPoolExecutor(max_workers=max(len(jobs), 1)) as executor:
+                futures = []
+                for effective in jobs:
+                    output, name = get_output(effective)
+                    futures.append((effective, name, executor.submit(
+                        self.encode_target, converter, decoded[1], output, effective
+                    )))
+                for effective, name, future in futures:
+                    try:
+                        future.result()
+                        succeeded.append(effective)
+                        produced.append(name)
+                    except Exception as e:
+                        errors.append(f"{converter} {name}: {str(e)}")
+            
+            for i in pending:
+                effective = self.resolve_target(converter, targets[i])
+                if effective in succeeded:
+                    results[i] = effective
+        
+        if all(result is None for result in results):
+            return f"所有转换方法都失败。错误详情: {'; '.join(errors) or '没有可用的音频处理库'}"
+        if any(result is None for result in results):
+            return f"部分输出失败。已输出: {'、'.join(produced)}。错误详情: {'; '.join(errors)}"
+        
+        return results
+    
+    def convert_ogg_stream(self, source, output, target=DEFAULT_OUTPUT_TARGET):
+        """转换OGG字节数据或二进制流，结果写入output二进制流
+        
+        成功返回(写入字节数, 实际输出格式)，失败返回错误信息。
+        librosa方案无法输出MP3，此时写入的是WAV数据，调用方需检查实际输出格式。
+        """
+        try:
+            source = self.open_input_stream(source)
+            
+            # 编码器写入新建的内存缓冲区，避免pydub回到开头覆盖调用方流中已有的数据
+            buffer = io.BytesIO()
+            result = self.convert_targets(source, [target], lambda t: (buffer, "output"))
+            if isinstance(result, str):
+                return result
+            data = buffer.getbuffer()
+            output.write(data)
+            return data.nbytes, result[0]["format"]
+            
+        except Exception as e:
+            return self.describe_error(e)
+    
+    def convert_ogg_bytes(self, source, target=DEFAULT_OUTPUT_TARGET):
+        """转换OGG字节数据或二进制流，成功返回(字节数据, 实际输出格式)，失败返回错误信息"""
+        try:
+            source = self.open_input_stream(source)
+            buffer = io.BytesIO()
+            result = self.convert_targets(source, [target], lambda t: (buffer, "output"))
+            if isinstance(result, str):
+                return result
+            
+            return buffer.getvalue(), result[0]["format"]
+            
+        except Exception as e:
+            return self.describe_error(e)
+    
+    def check_input_file(self, ogg_path):
+        """检查输入文件，存在问题时返回错误信息"""
+        # 检查输入文件是否存在
+        if not os.path.exists(ogg_path):
+            return "输入文件不存在"
+        
+        # 检查文件大小
+        file_size = os.path.getsize(ogg_path)
+        if file_size == 0:
+            return "输入文件为空"
+        
+        return None
+    
+    def convert_ogg_to_targets(self, ogg_path, output_folder, base_name, targets):
+        """解码一次OGG文件并并行编码到多个输出目标，文件名由各目标的实际设置决定"""
+        try:
+            error = self.check_input_file(ogg_path)
+            if error:
+                return error
+            
+            def get_output(target):
+                file_name = self.get_target_file_name(base_name, target)
+                return os.path.join(output_folder, file_name), file_name
+            
+            # 直接传入路径，由解码器自行读取文件（pydub交给FFmpeg，librosa可回退到audioread）
+            result = self.convert_targets(ogg_path, targets, get_output)
+            if isinstance(result, str):
+                return result
+            
+            # 不同设置的目标被合并为同一文件（如librosa方案把多个mp3目标都输出为WAV）时视为失败
+            merged = {}
+            for target, effective in zip(targets, result):
+                file_name = self.get_target_file_name(base_name, effective)
+                merged.setdefault(file_name, []).append(self.format_target(target))
+            collapsed = [
+                f"{'、'.join(specs)} -> {file_name}"
+                for file_name, specs in merged.items() if len(specs) > 1
+            ]
+            if collapsed:
+                return (
+                    f"部分输出目标无法按要求生成，已合并输出: {'; '.join(collapsed)}。"
+                    f"实际输出: {'、'.join(merged)}"
+                )
+            
+            return True
+            
+        except Exception as e:
+            return self.describe_error(e)
+    
+    def convert_ogg_to_mp3(self, ogg_path, mp3_path):
+        """转换单个OGG文件到MP3 - 多方案自动选择"""
+        try:
+            error = self.check_input_file(ogg_path)
+            if error:
+                return error
+            
+            def get_output(target):
+                # 按调用方指定的路径输出，仅librosa方案无法输出MP3时改为同名WAV
+                if target["format"] == DEFAULT_OUTPUT_TARGET["format"]:
+                    output_path = mp3_path
+                else:
+                    output_path = os.path.splitext(mp3_path)[0] + f".{target['format']}"
+                return output_path, os.path.basename(output_path)
+            
+            result = self.convert_targets(ogg_path, [DEFAULT_OUTPUT_TARGET], get_output)
+            return result if isinstance(result, str) else True
+            
+        except Exception as e:
+            return self.describe_error(e)
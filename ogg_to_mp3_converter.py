@@ -13,34 +13,16 @@ import os
 import threading
 from pathlib import Path
 import sys
-import traceback
 import time
 
-# 延迟导入音频处理库以便给出更好的错误提示
-try:
-    from pydub import AudioSegment
-    PYDUB_AVAILABLE = True
-except ImportError:
-    PYDUB_AVAILABLE = False
-    AudioSegment = None
-
-# 尝试导入其他音频处理库作为备选
-try:
-    import librosa
-    import soundfile as sf
-    import numpy as np
-    LIBROSA_AVAILABLE = True
-except ImportError:
-    LIBROSA_AVAILABLE = False
-    sf = None
-    np = None
-
-try:
-    import mutagen
-    from mutagen.oggvorbis import OggVorbis
-    MUTAGEN_AVAILABLE = True
-except ImportError:
-    MUTAGEN_AVAILABLE = False
+from ogg_audio_converter import (
+    DEFAULT_OUTPUT_TARGET,
+    DEFAULT_OUTPUT_TARGETS,
+    LIBROSA_AVAILABLE,
+    PYDUB_AVAILABLE,
+    OGGAudioConverter,
+    get_available_converters,
+)
 
 # 设置主题
 ctk.set_appearance_mode("dark")
@@ -49,13 +31,7 @@ ctk.set_default_color_theme("blue")
 class OGGToMP3Converter:
     def __init__(self):
         # 检查音频处理库依赖
-        available_libs = []
-        if PYDUB_AVAILABLE:
-            available_libs.append("pydub")
-        if LIBROSA_AVAILABLE:
-            available_libs.append("librosa")
-        if MUTAGEN_AVAILABLE:
-            available_libs.append("mutagen")
+        available_libs = get_available_converters()
         
         if not available_libs:
             root = tk.Tk()
@@ -73,7 +49,7 @@ class OGGToMP3Converter:
             sys.exit(1)
         
         # 设置转换器优先级
-        self.converter_priority = available_libs
+        self.audio_converter = OGGAudioConverter(available_libs)
         
         # 初始化主窗口
         self.root = TkinterDnD.Tk()
@@ -98,6 +74,7 @@ class OGGToMP3Converter:
         self.output_path = ""
         self.ogg_files = []
         self.failed_files = []
+        self.output_targets = [DEFAULT_OUTPUT_TARGET]
         self.is_converting = False
         
         self.setup_ui()
@@ -212,6 +189,20 @@ class OGGToMP3Converter:
             width=150
         ).pack(side="right", padx=15, pady=10)
         
+        # 输出目标设置（每个输入只解码一次，同时输出到所有目标）
+        targets_frame = ctk.CTkFrame(output_frame)
+        targets_frame.pack(fill="x", padx=20, pady=(0, 15))
+        
+        ctk.CTkLabel(
+            targets_frame,
+            text="🎚 输出目标 (mp3:码率 / wav::采样格式，逗号分隔):",
+            font=ctk.CTkFont(size=12)
+        ).pack(side="left", padx=(15, 10), pady=15)
+        
+        self.targets_entry = ctk.CTkEntry(targets_frame, width=260)
+        self.targets_entry.insert(0, DEFAULT_OUTPUT_TARGETS)
+        self.targets_entry.pack(side="right", padx=15, pady=10)
+        
         # 进度区域
         progress_frame = ctk.CTkFrame(main_frame)
         progress_frame.pack(fill="x", padx=20, pady=10)
@@ -377,130 +368,11 @@ class OGGToMP3Converter:
         except Exception:
             return False
     
-    def convert_with_librosa(self, ogg_path, mp3_path):
-        """使用librosa转换（转换为WAV格式，因为无FFmpeg时无法直接转MP3）"""
-        try:
-            if not LIBROSA_AVAILABLE or sf is None:
-                return "librosa或soundfile不可用"
-            
-            # 读取OGG文件
-            audio_data, sample_rate = librosa.load(ogg_path, sr=None)
-            
-            # 由于没有FFmpeg，我们转换为WAV格式
-            wav_path = mp3_path.replace('.mp3', '.wav')
-            
-            # 使用soundfile写入WAV文件
-            sf.write(wav_path, audio_data, sample_rate)
-            
-            # 验证输出文件
-            if os.path.exists(wav_path) and os.path.getsize(wav_path) > 0:
-                return f"已转换为WAV格式: {os.path.basename(wav_path)}"
-            else:
-                return "WAV文件创建失败"
-            
-        except Exception as e:
-            return f"librosa转换错误: {str(e)}"
-    
-    def convert_with_mutagen_simple(self, ogg_path, mp3_path):
-        """使用简单的文件复制方法（改变扩展名）"""
-        try:
-            # 读取OGG文件的音频数据
-            ogg_file = OggVorbis(ogg_path)
-            
-            # 这种方法主要是重新封装，质量可能不如真正的转换
-            # 但不需要外部依赖
-            import shutil
-            
-            # 创建一个基本的转换（实际上是复制+重命名）
-            # 注意：这不是真正的格式转换，只是文件复制
-            wav_path = mp3_path.replace('.mp3', '.wav')
-            
-            # 提取音频数据并写入新文件
-            # 这里简化处理，实际项目中需要更复杂的转换逻辑
-            return "mutagen方法需要额外的编码器支持"
-            
-        except Exception as e:
-            return f"mutagen转换错误: {str(e)}"
-    
     def convert_ogg_to_mp3(self, ogg_path, mp3_path):
         """转换单个OGG文件到MP3 - 多方案自动选择"""
-        try:
-            # 检查输入文件是否存在
-            if not os.path.exists(ogg_path):
-                return "输入文件不存在"
-            
-            # 检查文件大小
-            file_size = os.path.getsize(ogg_path)
-            if file_size == 0:
-                return "输入文件为空"
-            
-            # 按优先级尝试不同的转换方法
-            errors = []
-            
-            for converter in self.converter_priority:
-                try:
-                    if converter == "librosa" and LIBROSA_AVAILABLE:
-                        result = self.convert_with_librosa(ogg_path, mp3_path)
-                        if result == True or (isinstance(result, str) and "已转换为WAV格式" in result):
-                            return True
-                        else:
-                            errors.append(f"librosa: {result}")
-                        
-                    elif converter == "pydub" and PYDUB_AVAILABLE:
-                        try:
-                            # 使用pydub进行转换
-                            audio = AudioSegment.from_ogg(ogg_path)
-                            
-                            # 检查音频是否有效
-                            if len(audio) == 0:
-                                errors.append("pydub: 音频文件为空")
-                                continue
-                            
-                            # 导出为MP3格式
-                            audio.export(
-                                mp3_path, 
-                                format="mp3", 
-                                bitrate="192k",
-                                parameters=["-q:a", "2"]  # 高质量设置
-                            )
-                            
-                            # 验证输出文件
-                            if os.path.exists(mp3_path) and os.path.getsize(mp3_path) > 0:
-                                return True
-                            else:
-                                errors.append("pydub: 输出文件创建失败")
-                        except Exception as pe:
-                            errors.append(f"pydub: {str(pe)}")
-                            
-                    elif converter == "mutagen" and MUTAGEN_AVAILABLE:
-                        result = self.convert_with_mutagen_simple(ogg_path, mp3_path)
-                        if result == True:
-                            return True
-                        else:
-                            errors.append(f"mutagen: {result}")
-                            
-                except Exception as e:
-                    errors.append(f"{converter}: {str(e)}")
-                    continue
-            
-            # 所有方法都失败了，返回详细错误信息
-            return f"所有转换方法都失败。错误详情: {'; '.join(errors)}"
-            
-        except FileNotFoundError as e:
-            if "ffmpeg" in str(e).lower():
-                return "FFmpeg未安装。建议安装轻量级音频库: pip install librosa soundfile"
-            return f"文件操作错误: {str(e)}"
-        except Exception as e:
-            error_msg = str(e)
-            if "ffmpeg" in error_msg.lower():
-                return "FFmpeg相关错误。建议使用无FFmpeg依赖的方案"
-            elif "permission" in error_msg.lower():
-                return "文件权限错误，请检查文件是否被占用"
-            elif "memory" in error_msg.lower():
-                return "内存不足，请关闭其他程序后重试"
-            else:
-                return f"转换错误: {error_msg}"
-        
+        # 界面内部已改用convert_ogg_to_targets，保留此方法兼容直接调用它的已有脚本
+        return self.audio_converter.convert_ogg_to_mp3(ogg_path, mp3_path)
+    
     def start_conversion(self):
         """开始转换过程"""
         if self.is_converting:
@@ -515,6 +387,13 @@ class OGGToMP3Converter:
             messagebox.showerror("错误", "请选择输出文件夹!")
             return
             
+        # 解析输出目标
+        try:
+            self.output_targets = self.audio_converter.parse_output_targets(self.targets_entry.get())
+        except ValueError as e:
+            messagebox.showerror("错误", f"输出目标设置无效:\n{str(e)}")
+            return
+            
         # 检查输出文件夹是否可写
         try:
             test_file = os.path.join(self.output_path, "test_write_permission.tmp")
@@ -596,14 +475,13 @@ class OGGToMP3Converter:
                     output_folder = os.path.join(self.output_path, output_folder_name)
                     os.makedirs(output_folder, exist_ok=True)
                     
-                    # 生成输出文件路径
-                    mp3_file = os.path.join(output_folder, f"{base_name}.mp3")
-                    
                     # 更新进度 - 开始转换
                     self.root.after(0, lambda p=progress, f=file_name: self.update_progress(p, f"转换中: {f}"))
                     
-                    # 执行转换
-                    result = self.convert_ogg_to_mp3(ogg_file, mp3_file)
+                    # 执行转换（解码一次，输出到所有目标）
+                    result = self.audio_converter.convert_ogg_to_targets(
+                        ogg_file, output_folder, base_name, self.output_targets
+                    )
                     
                     if result is not True:
                         self.failed_files.append((ogg_file, result))
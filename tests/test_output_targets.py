@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""输出目标解析、文件命名与多目标转换测试"""
+
+import os
+
+import pytest
+
+from ogg_audio_converter import (
+    DEFAULT_OUTPUT_TARGET,
+    DEFAULT_OUTPUT_TARGETS,
+    OGGAudioConverter,
+)
+
+
+def read_outputs(folder):
+    return {
+        name: open(os.path.join(folder, name), "rb").read()
+        for name in sorted(os.listdir(folder))
+        if not name.endswith(".ogg")
+    }
+
+
+def test_parse_output_targets():
+    converter = OGGAudioConverter([])
+    targets = converter.parse_output_targets(" MP3:192k, mp3:96k ,wav::s24,, mp3:96k ")
+    assert targets == [
+        {"format": "mp3", "bitrate": "192k", "sample_format": None},
+        {"format": "mp3", "bitrate": "96k", "sample_format": None},
+        {"format": "wav", "bitrate": None, "sample_format": "s24"},
+    ]
+
+
+def test_default_target_matches_default_spec():
+    converter = OGGAudioConverter([])
+    assert converter.parse_output_targets(DEFAULT_OUTPUT_TARGETS) == [DEFAULT_OUTPUT_TARGET]
+
+
+@pytest.mark.parametrize("spec", [
+    "",
+    "ogg",
+    "wav:96k",
+    "flac:192k",
+    "mp3::s16",
+    "flac::f32",
+    "flac::s32",
+    "wav::u8",
+    "mp3:fast",
+    "mp3:192k:s16:extra",
+])
+def test_parse_output_targets_rejects_unsupported(spec):
+    with pytest.raises(ValueError):
+        OGGAudioConverter([]).parse_output_targets(spec)
+
+
+def test_format_target_round_trip():
+    converter = OGGAudioConverter([])
+    spec = "mp3, mp3:96k, wav::s24"
+    targets = converter.parse_output_targets(spec)
+    assert [converter.format_target(target) for target in targets] == ["mp3", "mp3:96k", "wav::s24"]
+
+
+def test_target_file_names_are_unique_per_setting():
+    converter = OGGAudioConverter([])
+    targets = converter.parse_output_targets("mp3, mp3:192k, mp3:96k, wav, wav::s24, flac::s16")
+    names = [converter.get_target_file_name("song", target) for target in targets]
+    assert names == [
+        "song.mp3", "song_192k.mp3", "song_96k.mp3", "song.wav", "song_s24.wav", "song_s16.flac"
+    ]
+    assert len(set(names)) == len(names)
+
+
+def test_fan_out_decodes_once(backends, ogg_file, tmp_path):
+    pydub, librosa = backends
+    converter = OGGAudioConverter(["pydub", "librosa"])
+    targets = converter.parse_output_targets("mp3, mp3:192k, mp3:96k, wav::s24")
+
+    assert converter.convert_ogg_to_targets(ogg_file, str(tmp_path), "song", targets) is True
+    assert len(pydub.sources) == 1
+    assert librosa.sources == []
+    outputs = read_outputs(str(tmp_path))
+    assert sorted(outputs) == ["song.mp3", "song_192k.mp3", "song_96k.mp3", "song_s24.wav"]
+    # 仅未指定码率的mp3使用VBR默认设置，显式码率均为固定码率
+    assert outputs["song.mp3"].startswith(b"pydub:mp3:192k:2:None:['-q:a', '2']")
+    assert outputs["song_192k.mp3"].startswith(b"pydub:mp3:192k:2:None:None")
+    assert outputs["song_96k.mp3"].startswith(b"pydub:mp3:96k:2:None:None")
+    assert outputs["song_s24.wav"].startswith(b"pydub:wav:None:3:None")
+
+
+def test_librosa_mp3_does_not_replace_wav_target(backends, ogg_file, tmp_path):
+    converter = OGGAudioConverter(["librosa"])
+    targets = converter.parse_output_targets("mp3:192k, wav::s24")
+
+    assert converter.convert_ogg_to_targets(ogg_file, str(tmp_path), "song", targets) is True
+    assert read_outputs(str(tmp_path)) == {
+        "song.wav": b"sf:WAV:None:44100",
+        "song_s24.wav": b"sf:WAV:PCM_24:44100",
+    }
+
+
+def test_collapsed_targets_are_reported(backends, ogg_file, tmp_path):
+    converter = OGGAudioConverter(["librosa"])
+    targets = converter.parse_output_targets("mp3:192k, mp3:96k, wav::s24")
+
+    result = converter.convert_ogg_to_targets(ogg_file, str(tmp_path), "song", targets)
+    assert "mp3:192k、mp3:96k -> song.wav" in result
+    assert "实际输出: song.wav、song_s24.wav" in result
+    assert sorted(read_outputs(str(tmp_path))) == ["song.wav", "song_s24.wav"]
+
+
+def test_failed_encode_falls_back_to_next_backend(backends, ogg_file, tmp_path):
+    pydub, librosa = backends
+    pydub.fail_formats = ("mp3",)
+    converter = OGGAudioConverter(["pydub", "librosa"])
+    targets = converter.parse_output_targets("mp3, wav::s24")
+
+    assert converter.convert_ogg_to_targets(ogg_file, str(tmp_path), "song", targets) is True
+    assert len(librosa.sources) == 1
+    outputs = read_outputs(str(tmp_path))
+    assert sorted(outputs) == ["song.wav", "song_s24.wav"]
+    assert outputs["song.wav"] == b"sf:WAV:None:44100"
+    assert outputs["song_s24.wav"].startswith(b"pydub:wav")
+
+
+def test_failure_without_fallback_is_reported(backends, ogg_file, tmp_path):
+    pydub, _ = backends
+    pydub.fail_formats = ("mp3",)
+    converter = OGGAudioConverter(["pydub"])
+    targets = converter.parse_output_targets("mp3, wav")
+
+    result = converter.convert_ogg_to_targets(ogg_file, str(tmp_path), "song", targets)
+    assert "部分输出失败。已输出: song.wav" in result
+    assert "song.mp3" in result
+    # 编码失败的文件不会残留
+    assert sorted(read_outputs(str(tmp_path))) == ["song.wav"]
+
+
+@pytest.mark.parametrize("file_name", ["out.mp3", "out.MP3", "out.bin"])
+def test_convert_ogg_to_mp3_uses_requested_path(backends, ogg_file, tmp_path, file_name):
+    converter = OGGAudioConverter(["pydub"])
+    mp3_path = str(tmp_path / file_name)
+
+    assert converter.convert_ogg_to_mp3(ogg_file, mp3_path) is True
+    assert sorted(read_outputs(str(tmp_path))) == [file_name]
+    assert open(mp3_path, "rb").read().startswith(b"pydub:mp3")
+
+
+def test_convert_ogg_to_mp3_librosa_writes_wav(backends, ogg_file, tmp_path):
+    converter = OGGAudioConverter(["librosa"])
+
+    assert converter.convert_ogg_to_mp3(ogg_file, str(tmp_path / "out.mp3")) is True
+    assert read_outputs(str(tmp_path)) == {"out.wav": b"sf:WAV:None:44100"}
+
+
+def test_missing_input(backends, tmp_path):
+    converter = OGGAudioConverter(["pydub"])
+    result = converter.convert_ogg_to_mp3(str(tmp_path / "none.ogg"), str(tmp_path / "none.mp3"))
+    assert result == "输入文件不存在"
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""字节数据/二进制流转换接口测试"""
+
+import io
+import os
+import subprocess
+import sys
+
+from ogg_audio_converter import OGGAudioConverter
+
+
+class ReadOnlyStream:
+    """只实现read()的最小输入流"""
+
+    def __init__(self, data):
+        self.data = data
+
+    def read(self, size=-1):
+        data, self.data = self.data, b""
+        return data
+
+
+class WriteOnlyStream:
+    """只实现write()的最小输出流"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+
+def test_bytes_round_trip(backends):
+    converter = OGGAudioConverter(["pydub"])
+    target = converter.parse_output_targets("mp3:96k")[0]
+
+    data, output_format = converter.convert_ogg_bytes(b"OggS data", target)
+    assert output_format == "mp3"
+    assert data.startswith(b"pydub:mp3:96k")
+
+
+def test_bytes_accepts_bytearray_and_memoryview(backends):
+    converter = OGGAudioConverter(["pydub"])
+    for source in (bytearray(b"OggS data"), memoryview(b"OggS data")):
+        data, output_format = converter.convert_ogg_bytes(source)
+        assert output_format == "mp3"
+        assert data.startswith(b"pydub:mp3:192k")
+
+
+def test_stream_round_trip_appends_to_output(backends):
+    converter = OGGAudioConverter(["pydub"])
+    output = io.BytesIO()
+    output.write(b"HEADER")
+
+    written, output_format = converter.convert_ogg_stream(io.BytesIO(b"OggS data"), output)
+    assert output_format == "mp3"
+    assert output.getvalue()[:6] == b"HEADER"
+    assert written == len(output.getvalue()) - 6
+
+
+def test_stream_minimal_file_likes(backends):
+    converter = OGGAudioConverter(["pydub"])
+    output = WriteOnlyStream()
+
+    written, output_format = converter.convert_ogg_stream(ReadOnlyStream(b"OggS data"), output)
+    assert output_format == "mp3"
+    assert written == len(b"".join(output.chunks)) > 0
+
+
+def test_stream_reports_actual_format_on_librosa(backends):
+    converter = OGGAudioConverter(["librosa"])
+    output = io.BytesIO()
+
+    written, output_format = converter.convert_ogg_stream(io.BytesIO(b"OggS data"), output)
+    assert output_format == "wav"
+    assert output.getvalue() == b"sf:WAV:None:44100"
+    assert written == len(output.getvalue())
+
+
+def test_stream_fallback_discards_partial_output(backends):
+    pydub, _ = backends
+    pydub.fail_formats = ("mp3",)
+    converter = OGGAudioConverter(["pydub", "librosa"])
+    output = io.BytesIO()
+
+    written, output_format = converter.convert_ogg_stream(io.BytesIO(b"OggS data"), output)
+    assert output_format == "wav"
+    assert output.getvalue() == b"sf:WAV:None:44100"
+
+
+def test_stream_failure_returns_message(backends):
+    pydub, _ = backends
+    pydub.fail_formats = ("mp3",)
+    converter = OGGAudioConverter(["pydub"])
+
+    result = converter.convert_ogg_stream(io.BytesIO(b"OggS data"), io.BytesIO())
+    assert isinstance(result, str)
+    assert "所有转换方法都失败" in result
+
+
+def test_path_conversion_passes_path_to_decoder(backends, ogg_file, tmp_path):
+    pydub, librosa = backends
+    converter = OGGAudioConverter(["pydub"])
+
+    assert converter.convert_ogg_to_mp3(ogg_file, str(tmp_path / "song.mp3")) is True
+    assert pydub.sources == [ogg_file]
+
+
+def test_core_module_has_no_gui_imports():
+    code = (
+        "import sys, ogg_audio_converter; "
+        "print(any(m.split('.')[0] in ('tkinter', 'customtkinter', 'tkinterdnd2') for m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    assert result.stdout.strip() == "False"